@@ -1,6 +1,12 @@
+import heapq as hq
+from array import array
+from bisect import bisect_right
+from math import isqrt
+
 from pyprimesieve import primes
 
 from .decorators import cached
+from .errors import InvalidArgumentError
 from .iteration import product
 
 
@@ -104,6 +110,52 @@ SOD_FUNCTIONS = {
     'modded': moddedSodFunction,
 }
 
+def divisorsFromPowers(prime_powers, ordered=False, bound=None):
+    """
+    Lazily yield the divisors of a number given (prime, power) pairs, optionally
+    only the ones <= bound.
+
+    With ordered=True the divisors come out in increasing order. They are merged with a
+    heap where each divisor only multiplies by primes at or after the last prime it used,
+    so every divisor is pushed exactly once.
+    """
+    pairs = sorted((p, power) for p, power in prime_powers if power != 0)
+    for p, power in pairs:
+        if power < 0:
+            raise InvalidArgumentError(f'Divisors need non-negative powers. {p}^{power} provided.')
+    if bound is not None and bound < 1:
+        return
+
+    if ordered:
+        heap = [(1, 0, (0,) * len(pairs))]
+        while heap:
+            divisor, last, exponents = hq.heappop(heap)
+            yield divisor
+            for index in range(last, len(pairs)):
+                p, power = pairs[index]
+                if exponents[index] == power:
+                    continue
+                multiple = divisor * p
+                if bound is not None and multiple > bound:
+                    # The primes are sorted, so later ones overshoot too
+                    break
+                grown = exponents[:index] + (exponents[index] + 1,) + exponents[index + 1:]
+                hq.heappush(heap, (multiple, index, grown))
+        return
+
+    def generate(index, divisor):
+        if index == len(pairs):
+            yield divisor
+            return
+        p, power = pairs[index]
+        for _ in range(power + 1):
+            yield from generate(index + 1, divisor)
+            divisor *= p
+            if bound is not None and divisor > bound:
+                break
+
+    yield from generate(0, 1)
+
 class Factorization:
     """
     Perform multiplicative operations on numbers given their factorizations
@@ -150,6 +202,9 @@ class Factorization:
         result = product(generator, modNumber)
         return mod(result, modNumber)
             
+    def divisors(self, ordered=False, bound=None):
+        return divisorsFromPowers(self.factors.items(), ordered, bound)
+
     def toProduct(self):
         return product(p ** power for p, power in self.factors.items())
 
@@ -208,6 +263,9 @@ class FactorizationWithList:
         result = product(generator, modNumber)
         return mod(result, modNumber)
             
+    def divisors(self, ordered=False, bound=None):
+        return divisorsFromPowers(zip(self.prime_numbers, self.powers), ordered, bound)
+
     def toProduct(self):
         if self.modNumber:
             generator = (pow(prime, power, self.modNumber) for prime, power in zip(self.prime_numbers, self.powers))
@@ -312,6 +370,326 @@ def getFactorizations(limit, prime_numbers=None):
                 current += multiplied
     return factorizations
 
+class DivisorTable:
+    """
+    All the divisors of every n < limit in compressed sparse row form.
+
+    The divisors of n are divisors[offsets[n]:offsets[n + 1]] in increasing order. Both
+    are flat arrays, so the table costs O(limit * log(limit)) machine words instead of
+    one Python list per number. It is built by a sieve over the multiples of each d.
+    """
+    def __init__(self, limit):
+        self.limit = limit
+        counts = array('q', [0]) * (limit + 1)
+        for d in range(1, limit):
+            for multiple in range(d, limit, d):
+                counts[multiple + 1] += 1
+
+        offsets = counts
+        for n in range(1, limit + 1):
+            offsets[n] += offsets[n - 1]
+
+        divisors = array('q', [0]) * offsets[limit]
+        position = array('q', offsets)
+        for d in range(1, limit):
+            for multiple in range(d, limit, d):
+                divisors[position[multiple]] = d
+                position[multiple] += 1
+
+        self.offsets = offsets
+        self.divisors = divisors
+
+    def __getitem__(self, n):
+        return self.divisors[self.offsets[n]:self.offsets[n + 1]]
+
+    def numOfDivisors(self, n):
+        return self.offsets[n + 1] - self.offsets[n]
+
+def powerSum(n, power):
+    """
+    Get the sum 1^power + 2^power + ... + n^power for small powers using closed forms.
+    """
+    if power not in POWER_SUM_FUNCTIONS:
+        raise InvalidArgumentError(f'Power sums are only supported for powers {sorted(POWER_SUM_FUNCTIONS)}. {power} provided.')
+    return POWER_SUM_FUNCTIONS[power](n)
+
+# Closed forms for 1^k + 2^k + ... + n^k
+POWER_SUM_FUNCTIONS = {
+    0: lambda n: n,
+    1: lambda n: n * (n + 1) // 2,
+    2: lambda n: n * (n + 1) * (2 * n + 1) // 6,
+    3: lambda n: (n * (n + 1) // 2) ** 2,
+}
+
+class FloorTable:
+    """
+    Store the values of a function at every distinct floor(x/k) for k >= 1.
+
+    Values v <= limit are kept in the list "small" indexed by v, the rest are kept
+    in the list "large" indexed by k = x // v. With limit around sqrt(x) both lists
+    have O(sqrt(x)) entries instead of one entry per number up to x.
+    """
+    def __init__(self, x, small: list, large: list):
+        self.x = x
+        self.small = small
+        self.large = large
+        self.limit = len(small) - 1
+
+    def __getitem__(self, v):
+        if v <= self.limit:
+            return self.small[v]
+        return self.large[self.x // v]
+
+    def __len__(self):
+        return self.limit + len(self.large) - 1
+
+    def keys(self):
+        """
+        Yield the distinct values of floor(x/k) (plus the small values) in increasing order.
+        """
+        yield from range(1, self.limit + 1)
+        for k in range(len(self.large) - 1, 0, -1):
+            yield self.x // k
+
+    def items(self):
+        for v in self.keys():
+            yield v, self[v]
+
+def floorTableLarge(x, limit):
+    """
+    Get the values floor(x/k) that are larger than limit, indexed by k.
+    Index 0 is unused and is set to 0.
+    """
+    return [0] + [x // k for k in range(1, x // (limit + 1) + 1)]
+
+def lucyPrimeTable(x, power=0, modNumber=None):
+    """
+    Get the sum of p^power over primes p <= v for every distinct v = floor(x/k).
+    This is Lucy_Hedgehog's algorithm, which runs in O(x^(3/4)) time and O(sqrt(x)) memory.
+
+    Start with S(v) = 2^power + 3^power + ... + v^power and, for each prime p <= sqrt(x),
+    remove the numbers whose smallest prime factor is p:
+        S(v) -= p^power * (S(v // p) - S(p - 1))    for all v >= p^2
+    Use power=0 for the prime-counting function and power=1 for the sum of primes.
+    """
+    if x < 1:
+        raise InvalidArgumentError(f'The limit must be a positive integer. {x} provided.')
+    root = isqrt(x)
+    small = [mod(powerSum(v, power) - 1, modNumber) for v in range(root + 1)]
+    small[0] = 0
+    large = [mod(powerSum(v, power) - 1, modNumber) for v in floorTableLarge(x, root)]
+    large[0] = 0
+    large_length = len(large) - 1
+
+    for p in primes(root + 1):
+        previous = small[p - 1]
+        p_power = mod(pow(p, power), modNumber)
+        square = p * p
+
+        for k in range(1, min(large_length, x // square) + 1):
+            d = k * p
+            below = large[d] if d <= large_length else small[x // d]
+            large[k] = mod(large[k] - p_power * (below - previous), modNumber)
+
+        for v in range(root, square - 1, -1):
+            small[v] = mod(small[v] - p_power * (small[v // p] - previous), modNumber)
+
+    return FloorTable(x, small, large)
+
+def primeCount(x):
+    """
+    Get the number of primes up to x (inclusive) using Lucy_Hedgehog's algorithm.
+    """
+    if x < 2:
+        return 0
+    return lucyPrimeTable(x)[x]
+
+def primeSum(x, modNumber=None):
+    """
+    Get the sum of primes up to x (inclusive) using Lucy_Hedgehog's algorithm.
+    """
+    if x < 2:
+        return 0
+    return lucyPrimeTable(x, 1, modNumber)[x]
+
+def integerRoot(x, k):
+    """
+    Get the largest integer r with r^k <= x.
+    """
+    root = int(round(x ** (1 / k)))
+    while pow(root, k) > x:
+        root -= 1
+    while pow(root + 1, k) <= x:
+        root += 1
+    return root
+
+def lehmerPrimeCount(x, prime_numbers=None):
+    """
+    Get the number of primes up to x (inclusive) using the Meissel-Lehmer method.
+    The optional list of prime numbers must contain all primes up to sqrt(x).
+
+    This only gives pi(x) itself, use lucyPrimeTable when the values at every
+    floor(x/k) are needed.
+    """
+    if x < 2:
+        return 0
+    if prime_numbers:
+        ps = prime_numbers
+    else:
+        ps = primes(max(isqrt(x), 2) + 1)
+    largest = ps[-1]
+    phi_cache = dict()
+    pi_cache = dict()
+
+    def phi(v, a):
+        # Count the numbers in [1, v] that are not divisible by any of the first a primes
+        if a == 0 or v == 0:
+            return v
+        if a == 1:
+            return (v + 1) // 2
+        if v < ps[a - 1]:
+            return 1
+        if v <= largest and a < len(ps) and v < ps[a] * ps[a]:
+            return bisect_right(ps, v) - a + 1
+        key = (v, a)
+        if key not in phi_cache:
+            phi_cache[key] = phi(v, a - 1) - phi(v // ps[a - 1], a - 1)
+        return phi_cache[key]
+
+    def pi(v):
+        if v <= largest:
+            return bisect_right(ps, v)
+        if v in pi_cache:
+            return pi_cache[v]
+        a = pi(integerRoot(v, 4))
+        b = pi(isqrt(v))
+        c = pi(integerRoot(v, 3))
+        count = phi(v, a) + (b + a - 2) * (b - a + 1) // 2
+        for i in range(a + 1, b + 1):
+            w = v // ps[i - 1]
+            count -= pi(w)
+            if i <= c:
+                for j in range(i, pi(isqrt(w)) + 1):
+                    count -= pi(w // ps[j - 1]) - (j - 1)
+        pi_cache[v] = count
+        return count
+
+    return pi(x)
+
+def totientsAndMobius(limit):
+    """
+    Get Euler's totient phi(n) and the Mobius function mu(n) for all n < limit.
+    This uses a linear sieve, so every composite is crossed out exactly once.
+    """
+    phi = list(range(limit))
+    mu = [1] * limit
+    if limit > 0:
+        mu[0] = 0
+    is_composite = bytearray(limit)
+    prime_numbers = []
+    for n in range(2, limit):
+        if not is_composite[n]:
+            prime_numbers.append(n)
+            phi[n] = n - 1
+            mu[n] = -1
+        for p in prime_numbers:
+            multiple = n * p
+            if multiple >= limit:
+                break
+            is_composite[multiple] = 1
+            if n % p == 0:
+                phi[multiple] = phi[n] * p
+                mu[multiple] = 0
+                break
+            phi[multiple] = phi[n] * (p - 1)
+            mu[multiple] = -mu[n]
+    return phi, mu
+
+def prefixSums(values, modNumber=None):
+    """
+    Get the running sums of a list, starting from values[0].
+    """
+    sums = []
+    total = 0
+    for value in values:
+        total = mod(total + value, modNumber)
+        sums.append(total)
+    return sums
+
+def dirichletSummatory(x, prefix: list, g_sum, h_sum, modNumber=None):
+    """
+    Get F(v) = f(1) + ... + f(v) for every distinct v = floor(x/k) given a Dirichlet
+    convolution f * g = h with g(1) = 1, where G and H are the summatory functions of g and h.
+
+    Summing (f * g)(n) over n <= v gives the recursion
+        F(v) = H(v) - sum over 2 <= d <= v of g(d) * F(v // d)
+    which is evaluated in blocks of d with the same value of v // d. The list "prefix"
+    holds the known values F(0), F(1), ..., F(L), usually sieved up to L ~ x^(2/3), and
+    the remaining values are memoized in increasing order. The total cost is O(x^(2/3))
+    when L is chosen that way.
+    """
+    if len(prefix) <= isqrt(x):
+        raise InvalidArgumentError(f'The prefix must cover at least sqrt(x) = {isqrt(x)}. {len(prefix) - 1} provided.')
+    small = [mod(value, modNumber) for value in prefix]
+    large = floorTableLarge(x, len(small) - 1)
+    table = FloorTable(x, small, large)
+
+    for k in range(len(large) - 1, 0, -1):
+        v = x // k
+        total = h_sum(v)
+        d = 2
+        while d <= v:
+            q = v // d
+            last = v // q
+            total -= (g_sum(last) - g_sum(d - 1)) * table[q]
+            d = last + 1
+        large[k] = mod(total, modNumber)
+
+    return table
+
+def summatorySieveLimit(x):
+    """
+    Get a sieve limit around x^(2/3) that balances sieving against the memoized recursion.
+    """
+    return max(integerRoot(x * x, 3), isqrt(x)) + 1
+
+def totientSummatoryTable(x, modNumber=None):
+    """
+    Get phi(1) + ... + phi(v) for every distinct v = floor(x/k) in O(x^(2/3)) time.
+    This uses phi * 1 = id together with a sieved prefix up to x^(2/3).
+    """
+    phi, _ = totientsAndMobius(min(summatorySieveLimit(x), x + 1))
+    return dirichletSummatory(
+        x, prefixSums(phi, modNumber), lambda n: n, lambda n: n * (n + 1) // 2, modNumber
+    )
+
+def mertensTable(x, modNumber=None):
+    """
+    Get the Mertens function M(v) = mu(1) + ... + mu(v) for every distinct v = floor(x/k)
+    in O(x^(2/3)) time. This uses mu * 1 = e (the Dirichlet identity) together with a
+    sieved prefix up to x^(2/3).
+    """
+    _, mu = totientsAndMobius(min(summatorySieveLimit(x), x + 1))
+    return dirichletSummatory(
+        x, prefixSums(mu, modNumber), lambda n: n, lambda n: 1 if n > 0 else 0, modNumber
+    )
+
+def totientSummatory(x, modNumber=None):
+    """
+    Get the sum phi(1) + phi(2) + ... + phi(x).
+    """
+    if x < 1:
+        return 0
+    return totientSummatoryTable(x, modNumber)[x]
+
+def mertens(x, modNumber=None):
+    """
+    Get the Mertens function M(x) = mu(1) + mu(2) + ... + mu(x).
+    """
+    if x < 1:
+        return 0
+    return mertensTable(x, modNumber)[x]
+
 def primorial(limit):
     """
     Get the primorial product (i.e. 2 * 3 * 5 * 7 * 11 ...) up to a limit.
@@ -44,6 +44,45 @@ def checkNumberTheory():
         if n > 0 and n != nn:
             print(n, nn, factors)
 
+def checkPrimeCounting():
+    from pyprimesieve import primes
+    from helpers.number_theory import lehmerPrimeCount, lucyPrimeTable, primeCount, primeSum
+
+    prime_numbers = primes(100001)
+    for x in [1, 2, 10, 97, 1000, 65536, 100000]:
+        below = [p for p in prime_numbers if p <= x]
+        assert primeCount(x) == len(below)
+        assert lehmerPrimeCount(x) == len(below)
+        assert primeSum(x) == sum(below)
+
+    table = lucyPrimeTable(1000)
+    for v, count in table.items():
+        assert count == len([p for p in prime_numbers if p <= v])
+
+def checkSummatoryFunctions():
+    from helpers.number_theory import mertens, mertensTable, totientsAndMobius, totientSummatory
+
+    phi, mu = totientsAndMobius(5001)
+    for x in [1, 2, 10, 99, 1000, 5000]:
+        assert totientSummatory(x) == sum(phi[1:x + 1])
+        assert totientSummatory(x, 1000) == sum(phi[1:x + 1]) % 1000
+        assert mertens(x) == sum(mu[1:x + 1])
+
+    table = mertensTable(5000)
+    for v, value in table.items():
+        assert value == sum(mu[1:v + 1])
+
+def checkDivisors():
+    from helpers.number_theory import DivisorTable, Factorization, factorize
+
+    table = DivisorTable(1000)
+    for n in range(2, 1000):
+        divisors = [d for d in range(1, n + 1) if n % d == 0]
+        factorization = Factorization(factorize(n))
+        assert list(factorization.divisors(ordered=True)) == divisors
+        assert sorted(factorization.divisors(bound=n // 2)) == divisors[:-1]
+        assert list(table[n]) == divisors
+
 def checkPartitionFunction():
     from helpers.partition_fxn import Partitions
 
@@ -61,6 +100,9 @@ def checkPartitionFunction():
 checkCheckers()
 checkPythagoreanTriples()
 checkNumberTheory()
+checkPrimeCounting()
+checkSummatoryFunctions()
+checkDivisors()
 checkPartitionFunction()
 
 print('\nSUCCESS!')
\ No newline at end of file